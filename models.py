@@ -4,7 +4,7 @@
 SQLAlchemyを使用したデータベーステーブルの定義
 """
 
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, Time, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Time, Text, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from database import Base
@@ -105,6 +105,8 @@ class Order(Base):
     __table_args__ = (
         # 複合インデックス: パフォーマンス最適化
         # ダッシュボードAPIで頻繁に使用されるクエリパターンに対応
+        # （店舗 + 注文日時の範囲 + ステータス。マイグレーション 002_perf_indexes と同名）
+        Index('ix_orders_store_ordered_status', 'store_id', 'ordered_at', 'status'),
         {'extend_existing': True}
     )
 
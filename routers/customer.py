@@ -5,7 +5,8 @@
 """
 
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from sqlalchemy import desc
 
@@ -20,6 +21,11 @@ from schemas import (
 
 router = APIRouter(prefix="/customer", tags=["お客様"])
 
+# メニュー一覧・注文履歴はリクエストごとにスキーマを組み立てず、
+# モジュール読み込み時に作ったシリアライザでJSONへ直接変換する
+_MENU_LIST_ADAPTER = TypeAdapter(MenuListResponse)
+_ORDER_HISTORY_ADAPTER = TypeAdapter(OrderHistoryResponse)
+
 
 @router.get("/menus", response_model=MenuListResponse, summary="メニュー一覧取得")
 def get_menus(
@@ -64,7 +70,8 @@ def get_menus(
     offset = (page - 1) * per_page
     menus = query.offset(offset).limit(per_page).all()
     
-    return {"menus": menus, "total": total}
+    payload = _MENU_LIST_ADAPTER.validate_python({"menus": menus, "total": total}, from_attributes=True)
+    return Response(content=_MENU_LIST_ADAPTER.dump_json(payload), media_type="application/json")
 
 
 @router.get("/menus/{menu_id}", response_model=MenuResponse, summary="メニュー詳細取得")
@@ -191,25 +198,10 @@ def get_my_orders(
     results = query.offset(offset).limit(per_page).all()
     
     # OrderHistoryItem形式に変換
-    order_items = []
-    for result in results:
-        order_item = OrderHistoryItem(
-            id=result.id,
-            quantity=result.quantity,
-            total_price=result.total_price,
-            status=result.status,
-            delivery_time=result.delivery_time,
-            notes=result.notes,
-            ordered_at=result.ordered_at,
-            updated_at=result.updated_at,
-            menu_id=result.menu_id,
-            menu_name=result.menu_name,
-            menu_image_url=result.menu_image_url,
-            menu_price=result.menu_price
-        )
-        order_items.append(order_item)
+    order_items = OrderHistoryItem.from_rows(results)
     
-    return OrderHistoryResponse(orders=order_items, total=total)
+    payload = OrderHistoryResponse(orders=order_items, total=total)
+    return Response(content=_ORDER_HISTORY_ADAPTER.dump_json(payload), media_type="application/json")
 
 
 @router.get("/orders/{order_id}", response_model=OrderResponse, summary="注文詳細取得")
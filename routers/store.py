@@ -6,16 +6,17 @@
 
 from typing import List, Optional
 from datetime import datetime, date, timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File
-from sqlalchemy.orm import Session
-from sqlalchemy import desc, func, and_
+from fastapi import APIRouter, Depends, HTTPException, status, Query, UploadFile, File, Response
+from pydantic import TypeAdapter
+from sqlalchemy.orm import Session, joinedload
+from sqlalchemy import desc, func, and_, case, extract
 import os
 import uuid
 from pathlib import Path
 
 from database import get_db
 from dependencies import get_current_store_user, require_role, get_current_active_user
-from models import User, Menu, Order, Store
+from models import User, Menu, Order, Store, UserRole
 from schemas import (
     MenuCreate, MenuUpdate, MenuResponse, MenuListResponse,
     OrderResponse, OrderListResponse, OrderStatusUpdate, OrderSummary,
@@ -26,6 +27,10 @@ from schemas import (
 
 router = APIRouter(prefix="/store", tags=["店舗"])
 
+# 注文一覧・メニュー一覧のシリアライザ（customer.py と同じ方式）
+_ORDER_LIST_ADAPTER = TypeAdapter(OrderListResponse)
+_MENU_LIST_ADAPTER = TypeAdapter(MenuListResponse)
+
 
 # ===== 店舗プロフィール管理 =====
 
@@ -286,42 +291,54 @@ def get_dashboard(
     today_start = datetime.combine(today, datetime.min.time())
     today_end = datetime.combine(today, datetime.max.time())
     yesterday_start = datetime.combine(yesterday, datetime.min.time())
-    yesterday_end = datetime.combine(yesterday, datetime.max.time())
     
     store_id = current_user.store_id
     
-    # === 最適化: 本日の注文を1回のクエリで全件取得 ===
-    # DBへの往復を1回に削減し、Pythonメモリ上で集計
-    today_orders = db.query(Order).filter(
+    # === 最適化: 本日・前日のステータス別件数・売上を GROUP BY の1クエリで取得 ===
+    # 注文行を全件ロードせず、前日〜本日の範囲を1回だけ走査して
+    # CASE式で本日分と前日分に振り分けて集計する
+    is_today = Order.ordered_at >= today_start
+    status_rows = db.query(
+        Order.status,
+        func.sum(case((is_today, 1), else_=0)),
+        func.sum(case((is_today, Order.total_price), else_=0)),
+        func.sum(case((is_today, 0), else_=1)),
+        func.sum(case((is_today, 0), else_=Order.total_price))
+    ).filter(
         Order.store_id == store_id,
-        Order.ordered_at >= today_start,
+        Order.ordered_at >= yesterday_start,
         Order.ordered_at <= today_end
+    ).group_by(
+        Order.status
     ).all()
     
-    # Pythonメモリ上でステータス別集計（簡素化版: 4ステータス）
-    total_orders = len(today_orders)
-    pending_orders = sum(1 for o in today_orders if o.status == "pending")
-    ready_orders = sum(1 for o in today_orders if o.status == "ready")
-    completed_orders = sum(1 for o in today_orders if o.status == "completed")
-    cancelled_orders = sum(1 for o in today_orders if o.status == "cancelled")
+    # ステータス -> (本日件数, 本日売上)、ステータス -> (前日件数, 前日売上)
+    status_totals = {row[0]: (row[1] or 0, row[2] or 0) for row in status_rows}
+    yesterday_totals = {row[0]: (row[3] or 0, row[4] or 0) for row in status_rows}
+    
+    # ステータス別集計（簡素化版: 4ステータス）
+    total_orders = sum(count for count, _ in status_totals.values())
+    pending_orders = status_totals.get("pending", (0, 0))[0]
+    ready_orders = status_totals.get("ready", (0, 0))[0]
+    completed_orders = status_totals.get("completed", (0, 0))[0]
+    cancelled_orders = status_totals.get("cancelled", (0, 0))[0]
     
     # 売上計算（キャンセル除く）
-    total_sales = sum(o.total_price for o in today_orders if o.status != "cancelled")
+    total_sales = sum(
+        revenue for order_status, (_, revenue) in status_totals.items()
+        if order_status != "cancelled"
+    )
     
     # 平均注文単価の計算
     completed_order_count = total_orders - cancelled_orders
     average_order_value = float(total_sales) / completed_order_count if completed_order_count > 0 else 0.0
     
-    # === 最適化: 前日データを集約クエリで一括取得 ===
-    # キャンセル以外の注文数と売上を一度のクエリで取得
-    yesterday_orders = db.query(Order).filter(
-        Order.store_id == store_id,
-        Order.ordered_at >= yesterday_start,
-        Order.ordered_at <= yesterday_end
-    ).all()
-    
-    yesterday_orders_count = len(yesterday_orders)
-    yesterday_revenue = sum(o.total_price for o in yesterday_orders if o.status != "cancelled")
+    # 前日の注文数（全ステータス）と売上（キャンセル除く）
+    yesterday_orders_count = sum(count for count, _ in yesterday_totals.values())
+    yesterday_revenue = sum(
+        revenue for order_status, (_, revenue) in yesterday_totals.items()
+        if order_status != "cancelled"
+    )
     
     # 前日比較の計算
     orders_change = total_orders - yesterday_orders_count
@@ -365,11 +382,21 @@ def get_dashboard(
         for menu_id, menu_name, order_count, total_revenue in popular_menus_data
     ]
     
-    # === 最適化: 時間帯別注文数（既に取得した今日の注文データを再利用） ===
-    hourly_orders_dict = {}
-    for order in today_orders:
-        hour = order.ordered_at.hour
-        hourly_orders_dict[hour] = hourly_orders_dict.get(hour, 0) + 1
+    # === 最適化: 時間帯別注文数を GROUP BY hour の1クエリで取得し、欠けた時間帯は0で補完 ===
+    # extract('hour') は PostgreSQL では EXTRACT、SQLite では strftime('%H') にコンパイルされる
+    order_hour = extract('hour', Order.ordered_at)
+    hourly_rows = db.query(
+        order_hour,
+        func.count(Order.id)
+    ).filter(
+        Order.store_id == store_id,
+        Order.ordered_at >= today_start,
+        Order.ordered_at <= today_end
+    ).group_by(
+        order_hour
+    ).all()
+    
+    hourly_orders_dict = {int(hour): count for hour, count in hourly_rows}
     
     hourly_orders = [
         HourlyOrderData(hour=hour, order_count=hourly_orders_dict.get(hour, 0))
@@ -489,11 +516,11 @@ def get_all_orders(
         )
     
     # 自店舗の注文のみを取得
-    query = db.query(Order).filter(Order.store_id == current_user.store_id)
-    
-    # キーワード検索がある場合はJOINを追加
-    needs_user_join = False
-    needs_menu_join = False
+    # レスポンスに含めるユーザー（役割を含む）とメニューは一括で読み込み、N+1を避ける
+    query = db.query(Order).options(
+        joinedload(Order.user).selectinload(User.user_roles).joinedload(UserRole.role),
+        joinedload(Order.menu)
+    ).filter(Order.store_id == current_user.store_id)
     
     # ステータスフィルタ（複数選択対応）
     if order_status:
@@ -526,13 +553,7 @@ def get_all_orders(
     # キーワード検索（顧客名、メニュー名）
     if q:
         search_term = f"%{q}%"
-        # JOINを1回だけ行う
-        if not needs_user_join:
-            query = query.join(User, Order.user_id == User.id)
-            needs_user_join = True
-        if not needs_menu_join:
-            query = query.join(Menu, Order.menu_id == Menu.id)
-            needs_menu_join = True
+        query = query.join(User, Order.user_id == User.id).join(Menu, Order.menu_id == Menu.id)
         
         query = query.filter(
             (User.full_name.ilike(search_term)) |
@@ -557,15 +578,8 @@ def get_all_orders(
     offset = (page - 1) * per_page
     orders = query.offset(offset).limit(per_page).all()
     
-    # ユーザー情報とメニュー情報を含める（JOINしていない場合）
-    if not needs_user_join or not needs_menu_join:
-        for order in orders:
-            if not needs_user_join:
-                order.user = db.query(User).filter(User.id == order.user_id).first()
-            if not needs_menu_join:
-                order.menu = db.query(Menu).filter(Menu.id == order.menu_id).first()
-    
-    return {"orders": orders, "total": total}
+    payload = _ORDER_LIST_ADAPTER.validate_python({"orders": orders, "total": total}, from_attributes=True)
+    return Response(content=_ORDER_LIST_ADAPTER.dump_json(payload), media_type="application/json")
 
 
 @router.put("/orders/{order_id}/status", response_model=OrderResponse, summary="注文ステータス更新")
@@ -670,7 +684,8 @@ def get_all_menus(
     offset = (page - 1) * per_page
     menus = query.offset(offset).limit(per_page).all()
     
-    return {"menus": menus, "total": total}
+    payload = _MENU_LIST_ADAPTER.validate_python({"menus": menus, "total": total}, from_attributes=True)
+    return Response(content=_MENU_LIST_ADAPTER.dump_json(payload), media_type="application/json")
 
 
 @router.post("/menus", response_model=MenuResponse, summary="メニュー作成")
@@ -12,10 +12,9 @@ API契約定義 - Single Source of Truth
 """
 
 from datetime import datetime, time
-from typing import Optional, List, Literal
-from pydantic import BaseModel, EmailStr, Field, field_validator
+from typing import Optional, List, Literal, Annotated, ClassVar, Tuple, Iterable
+from pydantic import BaseModel, EmailStr, Field, StringConstraints, field_validator
 from enum import Enum
-import re
 
 
 # ===== 注文ステータス定義 =====
@@ -57,6 +56,11 @@ class OrderStatus(str, Enum):
 
 # ===== 共通型定義 =====
 
+# 軽量なメールアドレス型（email_validatorを使わず正規表現のみで検証）
+# 厳密なRFC検証が必要なサインアップ（UserCreate）のみEmailStrを使用する
+Email = Annotated[str, StringConstraints(pattern=r'^[^@\s]+@[^@\s]+\.[^@\s]+$', max_length=254)]
+
+
 class SuccessResponse(BaseModel):
     """成功時の共通レスポンス"""
     success: bool = True
@@ -70,6 +74,35 @@ class ErrorResponse(BaseModel):
     detail: Optional[str] = None
 
 
+class RowConvertibleModel(BaseModel):
+    """
+    クエリ結果の行から一括変換できるレスポンスの基底クラス
+
+    フィールド名のタプルをクラス定義時に一度だけ作成しておき、
+    行ごとに model_fields を走査するコストを省く
+    """
+    _FIELD_NAMES: ClassVar[Tuple[str, ...]] = ()
+
+    @classmethod
+    def __pydantic_init_subclass__(cls, **kwargs):
+        super().__pydantic_init_subclass__(**kwargs)
+        cls._FIELD_NAMES = tuple(cls.model_fields.keys())
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> list:
+        """
+        DBから取得済みの行をバリデーションなしでモデルに変換
+
+        Args:
+            rows: フィールド名と同名の属性を持つ行のイテラブル
+
+        Returns:
+            モデルインスタンスのリスト
+        """
+        names = cls._FIELD_NAMES
+        return [cls.model_construct(**{name: getattr(row, name) for name in names}) for row in rows]
+
+
 # ===== 認証関連 =====
 
 class UserCreate(BaseModel):
@@ -87,24 +120,6 @@ class UserLogin(BaseModel):
     password: str
 
 
-class RoleResponse(BaseModel):
-    """ロール情報のレスポンス"""
-    id: int
-    name: str
-    
-    class Config:
-        from_attributes = True
-
-
-class UserRoleResponse(BaseModel):
-    """ユーザーロール情報のレスポンス"""
-    id: int
-    role: RoleResponse
-    
-    class Config:
-        from_attributes = True
-
-
 class UserResponse(BaseModel):
     """ユーザー情報のレスポンス"""
     id: int
@@ -115,13 +130,14 @@ class UserResponse(BaseModel):
     is_active: bool
     store_id: Optional[int] = None
     created_at: datetime
-    user_roles: List[UserRoleResponse] = []
+    user_roles: List['UserRoleResponse'] = []
     
     # 店舗情報も含める(オプショナル)
     store: Optional['StoreResponse'] = None
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class TokenResponse(BaseModel):
@@ -136,7 +152,7 @@ class TokenResponse(BaseModel):
 
 class PasswordResetRequest(BaseModel):
     """パスワードリセット要求"""
-    email: EmailStr
+    email: Email
 
 
 class PasswordResetConfirm(BaseModel):
@@ -161,6 +177,7 @@ class RoleResponse(BaseModel):
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class RoleAssignRequest(BaseModel):
@@ -180,6 +197,7 @@ class UserRoleResponse(BaseModel):
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class UserWithRolesResponse(BaseModel):
@@ -196,90 +214,51 @@ class UserWithRolesResponse(BaseModel):
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 # ===== 店舗（Store）関連 =====
 
 class StoreBase(BaseModel):
-    """店舗の基本情報"""
-    name: str = Field(..., min_length=1, max_length=100, description="店舗名")
-    address: str = Field(..., min_length=1, max_length=255, description="住所")
-    phone_number: str = Field(..., min_length=10, max_length=20, description="電話番号（ハイフンあり/なし両対応）")
-    email: EmailStr = Field(..., description="店舗のメールアドレス")
-    opening_time: time = Field(..., description="開店時刻")
-    closing_time: time = Field(..., description="閉店時刻")
-    description: Optional[str] = Field(None, max_length=1000, description="店舗説明")
-    image_url: Optional[str] = Field(None, max_length=500, description="店舗画像URL")
-    is_active: bool = Field(True, description="店舗の有効/無効状態")
-
-    @field_validator('phone_number')
-    @classmethod
-    def validate_phone_number(cls, v: str) -> str:
-        """電話番号の形式を検証（日本の電話番号形式）"""
-        # ハイフンを除去して数字のみにする
-        digits_only = re.sub(r'[^0-9]', '', v)
-        
-        # 10桁または11桁の数字であることを確認
-        if not re.match(r'^0\d{9,10}$', digits_only):
-            raise ValueError('電話番号は0から始まる10桁または11桁の数字である必要があります（例: 03-1234-5678, 090-1234-5678）')
-        
-        return v
-
-    @field_validator('closing_time')
-    @classmethod
-    def validate_closing_time(cls, v: time, info) -> time:
-        """閉店時刻が開店時刻より後であることを検証"""
-        # info.data から opening_time を取得
-        if 'opening_time' in info.data:
-            opening_time = info.data['opening_time']
-            if v == opening_time:
-                raise ValueError('閉店時刻は開店時刻と同じにはできません')
-            # 開店時刻 < 閉店時刻（同日営業）または 開店時刻 > 閉店時刻（翌日営業）を許容
-        return v
+    """店舗基本情報"""
+    name: str = Field(..., min_length=1, max_length=100)
+    address: Optional[str] = Field(None, max_length=255)
+    phone_number: Optional[str] = Field(None, max_length=20)
+    email: Optional[Email] = None
+    opening_time: Optional[time] = None
+    closing_time: Optional[time] = None
+    description: Optional[str] = Field(None, max_length=1000)
+    is_active: Optional[bool] = True
 
 
 class StoreCreate(StoreBase):
-    """店舗作成時のリクエスト"""
-    pass
+    """店舗作成リクエスト"""
+    opening_time: time = Field(..., description="開店時間")
+    closing_time: time = Field(..., description="閉店時間")
 
 
 class StoreUpdate(BaseModel):
-    """店舗更新時のリクエスト（すべてオプショナル）"""
-    name: Optional[str] = Field(None, min_length=1, max_length=100, description="店舗名")
-    address: Optional[str] = Field(None, min_length=1, max_length=255, description="住所")
-    phone_number: Optional[str] = Field(None, min_length=10, max_length=20, description="電話番号")
-    email: Optional[EmailStr] = Field(None, description="店舗のメールアドレス")
-    opening_time: Optional[time] = Field(None, description="開店時刻")
-    closing_time: Optional[time] = Field(None, description="閉店時刻")
-    description: Optional[str] = Field(None, max_length=1000, description="店舗説明")
-    image_url: Optional[str] = Field(None, max_length=500, description="店舗画像URL")
-    is_active: Optional[bool] = Field(None, description="店舗の有効/無効状態")
-
-    @field_validator('phone_number')
-    @classmethod
-    def validate_phone_number(cls, v: Optional[str]) -> Optional[str]:
-        """電話番号の形式を検証（日本の電話番号形式）"""
-        if v is None:
-            return v
-        
-        # ハイフンを除去して数字のみにする
-        digits_only = re.sub(r'[^0-9]', '', v)
-        
-        # 10桁または11桁の数字であることを確認
-        if not re.match(r'^0\d{9,10}$', digits_only):
-            raise ValueError('電話番号は0から始まる10桁または11桁の数字である必要があります（例: 03-1234-5678, 090-1234-5678）')
-        
-        return v
+    """店舗更新リクエスト（部分更新対応）"""
+    name: Optional[str] = Field(None, min_length=1, max_length=100)
+    address: Optional[str] = Field(None, max_length=255)
+    phone_number: Optional[str] = Field(None, max_length=20)
+    email: Optional[Email] = None
+    opening_time: Optional[time] = None
+    closing_time: Optional[time] = None
+    description: Optional[str] = Field(None, max_length=1000)
+    is_active: Optional[bool] = None
 
 
 class StoreResponse(StoreBase):
-    """店舗情報のレスポンス"""
+    """店舗レスポンス"""
     id: int
+    image_url: Optional[str] = None
     created_at: datetime
     updated_at: datetime
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class StoreListResponse(BaseModel):
@@ -325,6 +304,7 @@ class MenuResponse(MenuBase):
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class MenuListResponse(BaseModel):
@@ -390,6 +370,7 @@ class OrderResponse(BaseModel):
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class OrderListResponse(BaseModel):
@@ -398,7 +379,7 @@ class OrderListResponse(BaseModel):
     total: int
 
 
-class OrderHistoryItem(BaseModel):
+class OrderHistoryItem(RowConvertibleModel):
     """注文履歴の項目（メニュー情報を含む）"""
     id: int
     quantity: int
@@ -417,6 +398,7 @@ class OrderHistoryItem(BaseModel):
 
     class Config:
         from_attributes = True
+        frozen = True
 
 
 class OrderHistoryResponse(BaseModel):
@@ -474,6 +456,9 @@ class DailySalesReport(BaseModel):
     total_sales: int
     popular_menu: Optional[str] = None
 
+    class Config:
+        frozen = True
+
 
 class MenuSalesReport(BaseModel):
     """メニュー別売上レポート"""
@@ -482,6 +467,9 @@ class MenuSalesReport(BaseModel):
     total_quantity: int
     total_sales: int
 
+    class Config:
+        frozen = True
+
 
 class SalesReportResponse(BaseModel):
     """売上レポートのレスポンス"""
@@ -493,6 +481,9 @@ class SalesReportResponse(BaseModel):
     total_sales: int
     total_orders: int
 
+    class Config:
+        frozen = True
+
 
 # ===== 検索・フィルタ関連 =====
 
@@ -528,57 +519,18 @@ class PaginationInfo(BaseModel):
     has_next: bool
     has_prev: bool
 
+    class Config:
+        frozen = True
+
 
 class PaginatedResponse(BaseModel):
     """ページネーション付きレスポンスの基底クラス"""
     pagination: PaginationInfo
 
 
-# ===== 店舗プロフィール =====
-
-class StoreBase(BaseModel):
-    """店舗基本情報"""
-    name: str = Field(..., min_length=1, max_length=100)
-    address: Optional[str] = Field(None, max_length=255)
-    phone_number: Optional[str] = Field(None, max_length=20)
-    email: Optional[EmailStr] = None
-    opening_time: Optional[time] = None
-    closing_time: Optional[time] = None
-    description: Optional[str] = Field(None, max_length=1000)
-    is_active: Optional[bool] = True
-
-
-class StoreCreate(StoreBase):
-    """店舗作成リクエスト"""
-    opening_time: time = Field(..., description="開店時間")
-    closing_time: time = Field(..., description="閉店時間")
-
-
-class StoreUpdate(BaseModel):
-    """店舗更新リクエスト（部分更新対応）"""
-    name: Optional[str] = Field(None, min_length=1, max_length=100)
-    address: Optional[str] = Field(None, max_length=255)
-    phone_number: Optional[str] = Field(None, max_length=20)
-    email: Optional[EmailStr] = None
-    opening_time: Optional[time] = None
-    closing_time: Optional[time] = None
-    description: Optional[str] = Field(None, max_length=1000)
-    is_active: Optional[bool] = None
-
-
-class StoreResponse(StoreBase):
-    """店舗レスポンス"""
-    id: int
-    image_url: Optional[str] = None
-    created_at: datetime
-    updated_at: datetime
-
-    class Config:
-        from_attributes = True
-
-
 # ===== 前方参照の解決 =====
-# StoreResponse の前方参照を解決
+# UserRoleResponse / StoreResponse の前方参照を解決
 UserResponse.model_rebuild()
+TokenResponse.model_rebuild()
 MenuResponse.model_rebuild()
 OrderResponse.model_rebuild()
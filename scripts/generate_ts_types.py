@@ -1,28 +1,60 @@
 """TypeScript型定義を生成"""
+import hashlib
 import sys
 from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+HASH_BANNER_PREFIX = '// schemas.py hash: '
+
+project_root = Path(__file__).parent.parent
+schemas_path = project_root / 'schemas.py'
+output_path = project_root / 'static' / 'js' / 'types' / 'api.ts'
+hash_path = output_path.with_name(output_path.name + '.hash')
+
+
+def read_embedded_hash(path: Path):
+    """api.ts先頭のバナーに埋め込まれたハッシュを取得"""
+    with open(path, encoding='utf-8') as f:
+        first_line = f.readline().strip()
+    if first_line.startswith(HASH_BANNER_PREFIX):
+        return first_line[len(HASH_BANNER_PREFIX):]
+    return None
+
+
+# schemas.pyの内容ハッシュが前回生成時と同じなら再生成をスキップ
+schemas_hash = hashlib.blake2b(schemas_path.read_bytes(), digest_size=16).hexdigest()
+
+if '--force' not in sys.argv and output_path.exists():
+    cached_hash = hash_path.read_text().strip() if hash_path.exists() else read_embedded_hash(output_path)
+    if cached_hash == schemas_hash:
+        print('✅ schemas.py is unchanged (cache hit), skipping generation.')
+        print(f'   Output: {output_path}')
+        sys.exit(0)
+
 from pydantic2ts import generate_typescript_defs
 
 print('🔄 Generating TypeScript types from Pydantic schemas...')
 
-output_path = Path(__file__).parent.parent / 'static' / 'js' / 'types' / 'api.ts'
-
 try:
     generate_typescript_defs(
         'schemas.py',
         str(output_path)
     )
+
+    # 生成元のハッシュをバナーとして埋め込み、古い出力を自己検出できるようにする
+    generated = output_path.read_text(encoding='utf-8')
+    output_path.write_text(f'{HASH_BANNER_PREFIX}{schemas_hash}\n{generated}', encoding='utf-8')
+    hash_path.write_text(schemas_hash + '\n')
+
     print(f'✅ TypeScript types generated successfully!')
     print(f'   Output: {output_path}')
-    
+
     # ファイルサイズを確認
     if output_path.exists():
         size = output_path.stat().st_size
         print(f'   File size: {size} bytes')
-    
+
 except Exception as e:
     print(f'❌ Error: {e}')
     import traceback
@@ -4,300 +4,486 @@ pytest設定とフィクスチャ
 テスト用のデータベース、クライアント、ユーザーなどを提供
 """
 
+import os
+import threading
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import NamedTuple, Optional
+
+import orjson
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, insert
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import QueuePool, StaticPool
 
 from main import app
-from database import Base, get_db
+from database import Base, SessionLocal, get_db
 from models import User, Menu, Order, Role, UserRole, Store
-from auth import get_password_hash
+from auth import create_access_token, get_password_hash, pwd_context
 from datetime import datetime, timedelta
 
 
+# テストでは bcrypt のコストを最小(4)に下げ、ハッシュ化・検証を高速化する
+# （既存ハッシュの検証はハッシュ内のコストで行われるため影響しない）
+pwd_context.update(bcrypt__rounds=4)
+
+# 注文フィクスチャの基準時刻
+# テストセッション開始時に1回だけ固定し、注文の日時順を決定的にする
+# （「本日」の集計対象に含まれるよう、固定の過去日付ではなく実行日の時刻を使う）
+NOW = datetime.utcnow().replace(microsecond=0)
+
 # テスト用インメモリデータベース
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# pytest-xdist のワーカーごとに名前付きの共有キャッシュDBを使い、`pytest -n auto` で並列実行できるようにする
+_XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER", "main")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///file:testdb_{_XDIST_WORKER}?mode=memory&cache=shared&uri=true"
+
+# コミット後も属性を失効させず、フィクスチャで refresh せずに値を参照できるようにする
+# autoflush は本番の SessionLocal と同じ設定を使い、テストでのフラッシュ挙動を本番に揃える
+TestingSessionLocal = sessionmaker(
+    autocommit=False,
+    autoflush=SessionLocal.kw["autoflush"],
+    expire_on_commit=False,
+)
+
+
+@dataclass(frozen=True, slots=True)
+class UserSeed:
+    """
+    テストユーザーの定義データ
+    role_name を持つユーザーは店舗ユーザーとして作成する
+    """
+    username: str
+    email: str
+    full_name: str
+    role_name: Optional[str] = None
+    store_key: Optional[str] = None
+
 
-engine = create_engine(
+class RoleRef(NamedTuple):
+    """
+    セッション共有の役割データの参照（主キーと役割名）
+    """
+    id: int
+    name: str
+
+
+# テストユーザー定義（ユーザー名 -> UserSeed）
+USERS = {seed.username: seed for seed in (
+    UserSeed("customer_a", "customer_a@test.com", "テスト顧客A"),
+    UserSeed("customer_b", "customer_b@test.com", "テスト顧客B"),
+    UserSeed("customer_empty", "customer_empty@test.com", "テスト顧客(履歴なし)"),
+    UserSeed("store_user", "store@test.com", "テスト店舗", "owner", "a"),
+    UserSeed("owner_user", "owner@test.com", "テストオーナー", "owner"),
+    UserSeed("manager_user", "manager@test.com", "テストマネージャー", "manager"),
+    UserSeed("staff_user", "staff@test.com", "テストスタッフ", "staff"),
+    UserSeed("owner_store_a", "owner_a@test.com", "店舗Aオーナー", "owner", "a"),
+    UserSeed("manager_store_a", "manager_a@test.com", "店舗Aマネージャー", "manager", "a"),
+    UserSeed("staff_store_a", "staff_a@test.com", "店舗Aスタッフ", "staff", "a"),
+    UserSeed("owner_store_b", "owner_b@test.com", "店舗Bオーナー", "owner", "b"),
+    UserSeed("manager_store_b", "manager_b@test.com", "店舗Bマネージャー", "manager", "b"),
+    UserSeed("staff_store_b", "staff_b@test.com", "店舗Bスタッフ", "staff", "b"),
+)}
+
+
+# 単一プロセス実行では接続を1本に固定し、xdist 並列実行時は接続プールを使う
+if int(os.getenv("PYTEST_XDIST_WORKER_COUNT", "1")) == 1:
+    _POOL_OPTIONS = {"poolclass": StaticPool}
+else:
+    _POOL_OPTIONS = {"poolclass": QueuePool, "pool_size": 10, "max_overflow": 20}
+
+test_engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
+    connect_args={"uri": True, "check_same_thread": False},
+    **_POOL_OPTIONS,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+# pysqlite の暗黙トランザクション制御を無効化し、SAVEPOINT を正しく扱えるようにする
+@event.listens_for(test_engine, "connect")
+def _disable_pysqlite_transaction(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(test_engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
+# 共有キャッシュのインメモリDBは最後の接続が閉じると破棄されるため、
+# テスト実行中は保持用の接続を開いておく
+_keepalive_connection = None
+
+
+def pytest_configure(config):
+    """
+    テスト用スキーマをフィクスチャ実行前に1回だけ作成する
+    """
+    global _keepalive_connection
+    _keepalive_connection = test_engine.connect()
+    # ワーカーごとに必ず空のDBから始まるため、既存テーブルの確認は省略する
+    Base.metadata.create_all(bind=test_engine, checkfirst=False)
+
+
+def pytest_unconfigure(config):
+    """
+    保持用の接続を閉じ、エンジンを破棄する
+    """
+    if _keepalive_connection is not None:
+        _keepalive_connection.close()
+    test_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+def engine():
+    """
+    テスト用データベースエンジンを提供
+    スキーマは pytest_configure で作成済み
+    """
+    return test_engine
+
+
+@pytest.fixture(scope="session")
+def connection(engine):
+    """
+    セッション全体で共有するデータベース接続
+    """
+    with engine.connect() as connection:
+        yield connection
 
 
 @pytest.fixture(scope="function")
-def db_session():
+def db_session(connection, roles, store_ids, menu_ids):
     """
     テスト用データベースセッションを提供
-    各テストごとに新しいデータベースを作成
+    各テストを外側のトランザクションで囲み、終了時にロールバックする
+    テスト内やAPI内での commit() は SAVEPOINT の解放として扱われる
+    参照データは外側のトランザクションを開始する前に投入しておく
+    （トランザクション内で投入するとロールバックで消えてしまうため）
     """
-    Base.metadata.create_all(bind=engine)
-    session = TestingSessionLocal()
+    trans = connection.begin()
+    session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield session
     finally:
         session.close()
-        Base.metadata.drop_all(bind=engine)
+        trans.rollback()
 
 
-@pytest.fixture(scope="function")
-def client(db_session):
+# SAVEPOINT等のトランザクション制御文はクエリ数に含めない
+_TRANSACTION_CONTROL_PREFIXES = ("SAVEPOINT", "RELEASE", "ROLLBACK", "BEGIN", "COMMIT")
+
+
+@pytest.fixture
+def assert_query_budget(engine):
     """
-    テスト用FastAPIクライアントを提供
+    ブロック内で発行されたSQL文の数が上限以下であることを検証するコンテキストマネージャを提供
+    N+1クエリの混入をテストで検出するために使う
+
+    使用例:
+        with assert_query_budget(max_queries=5):
+            client.get("/api/store/orders", headers=headers)
     """
-    def override_get_db():
+    @contextmanager
+    def _budget(max_queries: int):
+        statements = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            if not statement.lstrip().upper().startswith(_TRANSACTION_CONTROL_PREFIXES):
+                statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _count)
         try:
-            yield db_session
+            yield statements
         finally:
-            pass
-    
-    app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
-        yield test_client
-    app.dependency_overrides.clear()
+            event.remove(engine, "before_cursor_execute", _count)
+        assert len(statements) <= max_queries, (
+            f"{len(statements)} queries executed (budget: {max_queries}):\n"
+            + "\n".join(statements)
+        )
+    return _budget
+
+
+# ===== セッション共有の参照データ =====
+# 店舗・役割・メニューはセッション全体で1回だけ投入してコミットし、
+# 各テストの外側トランザクションのロールバックでは消えないようにする。
+# テストには主キーから db_session に再アタッチしたインスタンスを渡す。
+
+def _seed(connection, model, rows):
+    """
+    参照データを共有接続上で一括INSERTしてコミットし、主キーのリストを返す
+    ORMの一括INSERTを使い、オブジェクト単位のunit-of-work処理を避ける
+    """
+    with TestingSessionLocal(bind=connection) as session:
+        ids = session.scalars(
+            insert(model).returning(model.id, sort_by_parameter_order=True),
+            rows,
+        ).all()
+        session.commit()
+    return ids
+
+
+@pytest.fixture(scope="session")
+def roles(connection):
+    """
+    テスト用役割データを作成（役割名 -> RoleRef）
+    ORMインスタンスではなく主キーのタプルを返すため、テスト間で共有してもデタッチの問題が起きない
+    """
+    rows = [
+        {"name": "owner", "description": "店舗オーナー"},
+        {"name": "manager", "description": "店舗マネージャー"},
+        {"name": "staff", "description": "店舗スタッフ"},
+    ]
+    ids = _seed(connection, Role, rows)
+    return {row["name"]: RoleRef(role_id, row["name"]) for row, role_id in zip(rows, ids)}
+
+
+@pytest.fixture(scope="session")
+def store_ids(connection):
+    """
+    テスト用店舗A・BのID（"a"/"b" -> ID）
+    """
+    from datetime import time
+    ids = _seed(connection, Store, [
+        {
+            "name": "テスト店舗A",
+            "address": "東京都渋谷区1-2-3",
+            "phone_number": "03-1234-5678",
+            "email": "storea@test.com",
+            "opening_time": time(9, 0),
+            "closing_time": time(21, 0),
+            "description": "テスト用の店舗Aです",
+            "is_active": True,
+        },
+        {
+            "name": "テスト店舗B",
+            "address": "東京都新宿区4-5-6",
+            "phone_number": "03-9876-5432",
+            "email": "storeb@test.com",
+            "opening_time": time(10, 0),
+            "closing_time": time(22, 0),
+            "description": "テスト用の店舗Bです",
+            "is_active": True,
+        },
+    ])
+    return dict(zip(["a", "b"], ids))
+
+
+@pytest.fixture(scope="session")
+def menu_ids(connection, store_ids):
+    """
+    店舗Aのテスト用メニューのID（フィクスチャ名 -> ID）
+    """
+    ids = _seed(connection, Menu, [
+        {
+            "name": "テスト弁当",
+            "price": 800,
+            "description": "テスト用の弁当です",
+            "image_url": "https://example.com/test.jpg",
+            "is_available": True,
+            "store_id": store_ids["a"],
+        },
+        {
+            "name": "テスト弁当2",
+            "price": 900,
+            "description": "テスト用の弁当2です",
+            "image_url": "https://example.com/test2.jpg",
+            "is_available": True,
+            "store_id": store_ids["a"],
+        },
+        {
+            "name": "在庫切れ弁当",
+            "price": 1000,
+            "description": "在庫切れのテスト用弁当です",
+            "image_url": "https://example.com/unavailable.jpg",
+            "is_available": False,
+            "store_id": store_ids["a"],
+        },
+    ])
+    return dict(zip(["test_menu", "test_menu_2", "test_menu_unavailable"], ids))
+
+
+@pytest.fixture
+def store_a(db_session, store_ids):
+    """
+    テスト用店舗A
+    """
+    return db_session.get(Store, store_ids["a"])
 
 
 @pytest.fixture
-def customer_user_a(db_session):
+def store_b(db_session, store_ids):
     """
-    テスト用顧客ユーザーA
+    テスト用店舗B
     """
-    user = User(
-        username="customer_a",
-        email="customer_a@test.com",
-        full_name="テスト顧客A",
-        hashed_password=get_password_hash("password123"),
-        role="customer",
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+    return db_session.get(Store, store_ids["b"])
 
 
 @pytest.fixture
-def customer_user_b(db_session):
+def test_menu(db_session, menu_ids):
     """
-    テスト用顧客ユーザーB
+    テスト用メニュー
     """
-    user = User(
-        username="customer_b",
-        email="customer_b@test.com",
-        full_name="テスト顧客B",
-        hashed_password=get_password_hash("password123"),
-        role="customer",
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+    return db_session.get(Menu, menu_ids["test_menu"])
 
 
 @pytest.fixture
-def customer_user_empty(db_session):
+def test_menu_2(db_session, menu_ids):
     """
-    注文履歴がないテスト用顧客ユーザー
+    テスト用メニュー2
     """
-    user = User(
-        username="customer_empty",
-        email="customer_empty@test.com",
-        full_name="テスト顧客(履歴なし)",
-        hashed_password=get_password_hash("password123"),
-        role="customer",
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+    return db_session.get(Menu, menu_ids["test_menu_2"])
 
 
 @pytest.fixture
-def store_user(db_session, roles, store_a):
+def test_menu_unavailable(db_session, menu_ids):
     """
-    テスト用店舗ユーザー (owner権限付き)
-    既存テストとの互換性のため、ownerロールを自動割当
+    在庫切れのテスト用メニュー
     """
-    user = User(
-        username="store_user",
-        email="store@test.com",
-        full_name="テスト店舗",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        is_active=True,
-        store_id=store_a.id
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    # 既存テストとの互換性のため、ownerロールを割り当て
-    user_role = UserRole(user_id=user.id, role_id=roles["owner"].id)
-    db_session.add(user_role)
-    db_session.commit()
+    return db_session.get(Menu, menu_ids["test_menu_unavailable"])
+
+
+@pytest.fixture(scope="session")
+def _client():
+    """
+    セッション全体で共有するTestClient
+    アプリの起動・終了処理はセッションで1回だけ実行する
+    """
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(scope="session")
+def _authenticated_clients(auth_headers_for):
+    """
+    ユーザー名ごとに認証ヘッダーを既定で付与したTestClientを返す
+    トークンはユーザー名のみから作られるため、クライアントはセッション全体で使い回す
+    """
+    clients = {}
+    with ExitStack() as stack:
+        def _get(username: str) -> TestClient:
+            if username not in clients:
+                test_client = stack.enter_context(TestClient(app))
+                test_client.headers.update(auth_headers_for(username))
+                clients[username] = test_client
+            return clients[username]
+        yield _get
+
+
+@pytest.fixture(scope="function")
+def client(_client, db_session):
+    """
+    テスト用FastAPIクライアントを提供
+    クライアントは共有し、get_db の差し替えのみテストごとに行う
+    """
+    # 全リクエストが同じSessionを共有するため、並行リクエスト時もDB処理は1件ずつ行う
+    session_lock = threading.Lock()
+
+    def override_get_db():
+        with session_lock:
+            yield db_session
     
-    return user
+    # 既存の差し替えを退避して積み、終了時に元へ戻す（他の差し替えには触れない）
+    previous = app.dependency_overrides.get(get_db)
+    app.dependency_overrides[get_db] = override_get_db
+    yield _client
+    if previous is None:
+        del app.dependency_overrides[get_db]
+    else:
+        app.dependency_overrides[get_db] = previous
+
+
+@pytest.fixture(scope="session")
+def password_hash():
+    """
+    テストユーザー共通のパスワード "password123" のハッシュ
+    bcrypt は意図的に低速なため、セッション全体で1回だけ計算する
+    """
+    return get_password_hash("password123")
 
 
 @pytest.fixture
-def roles(db_session):
+def user_factory(db_session, password_hash, roles, store_ids):
     """
-    テスト用役割データを作成
+    テストユーザーを作成するファクトリ
+    UserSeed の定義からユーザーを作成し、役割があれば同時に割り当てる
     """
-    owner_role = Role(name="owner", description="店舗オーナー")
-    manager_role = Role(name="manager", description="店舗マネージャー")
-    staff_role = Role(name="staff", description="店舗スタッフ")
-    
-    db_session.add(owner_role)
-    db_session.add(manager_role)
-    db_session.add(staff_role)
-    db_session.commit()
-    
-    db_session.refresh(owner_role)
-    db_session.refresh(manager_role)
-    db_session.refresh(staff_role)
-    
-    return {
-        "owner": owner_role,
-        "manager": manager_role,
-        "staff": staff_role
-    }
+    def _make(seed: UserSeed):
+        user = User(
+            username=seed.username,
+            email=seed.email,
+            full_name=seed.full_name,
+            hashed_password=password_hash,
+            role="store" if seed.role_name else "customer",
+            store_id=store_ids[seed.store_key] if seed.store_key else None,
+            is_active=True
+        )
+        objs = [user]
+        if seed.role_name:
+            # リレーション経由で紐付け、ユーザーと役割を1回のコミットで保存する
+            objs.append(UserRole(user=user, role_id=roles[seed.role_name].id))
+        db_session.add_all(objs)
+        db_session.commit()
+        return user
+
+    return _make
 
 
 @pytest.fixture
-def owner_user(db_session, roles):
+def customer_user_a(user_factory):
     """
-    テスト用オーナーユーザー
+    テスト用顧客ユーザーA
     """
-    user = User(
-        username="owner_user",
-        email="owner@test.com",
-        full_name="テストオーナー",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    # ロールを割り当て
-    user_role = UserRole(user_id=user.id, role_id=roles["owner"].id)
-    db_session.add(user_role)
-    db_session.commit()
-    
-    return user
+    return user_factory(USERS["customer_a"])
 
 
 @pytest.fixture
-def manager_user(db_session, roles):
+def customer_user_b(user_factory):
     """
-    テスト用マネージャーユーザー
+    テスト用顧客ユーザーB
     """
-    user = User(
-        username="manager_user",
-        email="manager@test.com",
-        full_name="テストマネージャー",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    # ロールを割り当て
-    user_role = UserRole(user_id=user.id, role_id=roles["manager"].id)
-    db_session.add(user_role)
-    db_session.commit()
-    
-    return user
+    return user_factory(USERS["customer_b"])
 
 
 @pytest.fixture
-def staff_user(db_session, roles):
+def customer_user_empty(user_factory):
     """
-    テスト用スタッフユーザー
+    注文履歴がないテスト用顧客ユーザー
     """
-    user = User(
-        username="staff_user",
-        email="staff@test.com",
-        full_name="テストスタッフ",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    # ロールを割り当て
-    user_role = UserRole(user_id=user.id, role_id=roles["staff"].id)
-    db_session.add(user_role)
-    db_session.commit()
-    
-    return user
+    return user_factory(USERS["customer_empty"])
 
 
 @pytest.fixture
-def test_menu(db_session, store_a):
+def store_user(user_factory):
     """
-    テスト用メニュー
+    テスト用店舗ユーザー (owner権限付き)
+    既存テストとの互換性のため、ownerロールを自動割当
     """
-    menu = Menu(
-        name="テスト弁当",
-        price=800,
-        description="テスト用の弁当です",
-        image_url="https://example.com/test.jpg",
-        is_available=True,
-        store_id=store_a.id
-    )
-    db_session.add(menu)
-    db_session.commit()
-    db_session.refresh(menu)
-    return menu
+    return user_factory(USERS["store_user"])
 
 
 @pytest.fixture
-def test_menu_2(db_session, store_a):
+def owner_user(user_factory):
     """
-    テスト用メニュー2
+    テスト用オーナーユーザー
     """
-    menu = Menu(
-        name="テスト弁当2",
-        price=900,
-        description="テスト用の弁当2です",
-        image_url="https://example.com/test2.jpg",
-        is_available=True,
-        store_id=store_a.id
-    )
-    db_session.add(menu)
-    db_session.commit()
-    db_session.refresh(menu)
-    return menu
+    return user_factory(USERS["owner_user"])
 
 
 @pytest.fixture
-def test_menu_unavailable(db_session):
+def manager_user(user_factory):
     """
-    在庫切れのテスト用メニュー
+    テスト用マネージャーユーザー
     """
-    menu = Menu(
-        name="在庫切れ弁当",
-        price=1000,
-        description="在庫切れのテスト用弁当です",
-        image_url="https://example.com/unavailable.jpg",
-        is_available=False
-    )
-    db_session.add(menu)
-    db_session.commit()
-    db_session.refresh(menu)
-    return menu
+    return user_factory(USERS["manager_user"])
+
+
+@pytest.fixture
+def staff_user(user_factory):
+    """
+    テスト用スタッフユーザー
+    """
+    return user_factory(USERS["staff_user"])
 
 
 @pytest.fixture
@@ -306,54 +492,49 @@ def orders_for_customer_a(db_session, customer_user_a, test_menu, test_menu_2, s
     顧客Aの注文履歴を作成
     """
     # 3つの注文を作成（新しい順にテストするため、異なる日時で作成）
-    orders = []
-    
-    # 注文1（最古）
-    order1 = Order(
-        user_id=customer_user_a.id,
-        menu_id=test_menu.id,
-        store_id=store_a.id,
-        quantity=2,
-        total_price=test_menu.price * 2,
-        status="completed",
-        ordered_at=datetime.utcnow() - timedelta(days=2),
-        notes="最初の注文"
-    )
-    db_session.add(order1)
-    orders.append(order1)
-    
-    # 注文2（中間）
-    order2 = Order(
-        user_id=customer_user_a.id,
-        menu_id=test_menu_2.id,
-        store_id=store_a.id,
-        quantity=1,
-        total_price=test_menu_2.price * 1,
-        status="confirmed",
-        ordered_at=datetime.utcnow() - timedelta(days=1),
-        notes="2番目の注文"
-    )
-    db_session.add(order2)
-    orders.append(order2)
-    
-    # 注文3（最新）
-    order3 = Order(
-        user_id=customer_user_a.id,
-        menu_id=test_menu.id,
-        store_id=store_a.id,
-        quantity=3,
-        total_price=test_menu.price * 3,
-        status="pending",
-        ordered_at=datetime.utcnow(),
-        notes="最新の注文"
-    )
-    db_session.add(order3)
-    orders.append(order3)
-    
+    rows = [
+        # 注文1（最古）
+        dict(
+            user_id=customer_user_a.id,
+            menu_id=test_menu.id,
+            store_id=store_a.id,
+            quantity=2,
+            total_price=test_menu.price * 2,
+            status="completed",
+            ordered_at=NOW - timedelta(days=2),
+            notes="最初の注文"
+        ),
+        # 注文2（中間）
+        dict(
+            user_id=customer_user_a.id,
+            menu_id=test_menu_2.id,
+            store_id=store_a.id,
+            quantity=1,
+            total_price=test_menu_2.price * 1,
+            status="confirmed",
+            ordered_at=NOW - timedelta(days=1),
+            notes="2番目の注文"
+        ),
+        # 注文3（最新）
+        dict(
+            user_id=customer_user_a.id,
+            menu_id=test_menu.id,
+            store_id=store_a.id,
+            quantity=3,
+            total_price=test_menu.price * 3,
+            status="pending",
+            ordered_at=NOW,
+            notes="最新の注文"
+        ),
+    ]
+
+    # 1つの INSERT ... RETURNING で3件を作成し、Order インスタンスとして受け取る
+    orders = db_session.scalars(
+        insert(Order).returning(Order, sort_by_parameter_order=True),
+        rows,
+    ).all()
     db_session.commit()
-    for order in orders:
-        db_session.refresh(order)
-    
+
     return orders
 
 
@@ -362,352 +543,225 @@ def orders_for_customer_b(db_session, customer_user_b, test_menu, store_a):
     """
     顧客Bの注文履歴を作成
     """
-    orders = []
-    
-    # 注文1
-    order1 = Order(
-        user_id=customer_user_b.id,
-        menu_id=test_menu.id,
-        store_id=store_a.id,
-        quantity=1,
-        total_price=test_menu.price * 1,
-        status="pending",
-        ordered_at=datetime.utcnow(),
-        notes="顧客Bの注文"
-    )
-    db_session.add(order1)
-    orders.append(order1)
-    
+    orders = [
+        Order(
+            user_id=customer_user_b.id,
+            menu_id=test_menu.id,
+            store_id=store_a.id,
+            quantity=1,
+            total_price=test_menu.price * 1,
+            status="pending",
+            ordered_at=NOW,
+            notes="顧客Bの注文"
+        ),
+    ]
+
+    db_session.add_all(orders)
     db_session.commit()
-    for order in orders:
-        db_session.refresh(order)
-    
+
     return orders
 
 
 def get_auth_token(client, username: str, password: str) -> str:
     """
     認証トークンを取得するヘルパー関数
+    ログインAPIを経由せず、ログイン時と同じ内容のトークンを直接発行する
+    （client / password は既存呼び出しとの互換性のために受け取るのみ）
     """
-    response = client.post(
-        "/api/auth/login",
-        json={"username": username, "password": password}
-    )
-    assert response.status_code == 200
-    return response.json()["access_token"]
+    return create_access_token(data={"sub": username})
+
+
+def fast_json(response) -> dict:
+    """
+    レスポンスボディをorjsonでデコードするヘルパー関数
+    多数のフィールドを検証するテストで response.json() の代わりに使う
+    """
+    return orjson.loads(response.content)
+
+
+@pytest.fixture(scope="session")
+def auth_headers_for():
+    """
+    ユーザー名から認証ヘッダーを返す関数を提供
+    トークンはユーザー名ごとにセッション全体で1回だけ発行して使い回す
+    """
+    cache = {}
+
+    def _get(username: str, password: str = "password123") -> dict:
+        if username not in cache:
+            cache[username] = f"Bearer {get_auth_token(None, username, password)}"
+        return {"Authorization": cache[username]}
+    return _get
 
 
 @pytest.fixture
-def auth_headers_customer_a(client, customer_user_a):
+def auth_headers_customer_a(client, customer_user_a, auth_headers_for):
     """
     顧客Aの認証ヘッダー
     """
-    token = get_auth_token(client, "customer_a", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("customer_a")
 
 
 @pytest.fixture
-def auth_headers_customer_b(client, customer_user_b):
+def auth_headers_customer_b(client, customer_user_b, auth_headers_for):
     """
     顧客Bの認証ヘッダー
     """
-    token = get_auth_token(client, "customer_b", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("customer_b")
 
 
 @pytest.fixture
-def auth_headers_customer_empty(client, customer_user_empty):
+def auth_headers_customer_empty(client, customer_user_empty, auth_headers_for):
     """
     注文履歴がない顧客の認証ヘッダー
     """
-    token = get_auth_token(client, "customer_empty", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("customer_empty")
 
 
 @pytest.fixture
-def auth_headers_store(client, store_user):
+def auth_headers_store(client, store_user, auth_headers_for):
     """
     店舗ユーザーの認証ヘッダー
     """
-    token = get_auth_token(client, "store_user", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("store_user")
 
 
 @pytest.fixture
-def auth_headers_owner(client, owner_user):
+def auth_headers_owner(client, owner_user, auth_headers_for):
     """
     オーナーユーザーの認証ヘッダー
     """
-    token = get_auth_token(client, "owner_user", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("owner_user")
 
 
 @pytest.fixture
-def auth_headers_manager(client, manager_user):
+def auth_headers_manager(client, manager_user, auth_headers_for):
     """
     マネージャーユーザーの認証ヘッダー
     """
-    token = get_auth_token(client, "manager_user", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("manager_user")
 
 
 @pytest.fixture
-def auth_headers_staff(client, staff_user):
+def auth_headers_staff(client, staff_user, auth_headers_for):
     """
     スタッフユーザーの認証ヘッダー
     """
-    token = get_auth_token(client, "staff_user", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("staff_user")
 
 
 # ===== 店舗関連フィクスチャ =====
 
 @pytest.fixture
-def store_a(db_session):
+def owner_user_store_a(user_factory):
     """
-    テスト用店舗A
+    店舗Aのオーナーユーザー
     """
-    from datetime import time
-    store = Store(
-        name="テスト店舗A",
-        address="東京都渋谷区1-2-3",
-        phone_number="03-1234-5678",
-        email="storea@test.com",
-        opening_time=time(9, 0),
-        closing_time=time(21, 0),
-        description="テスト用の店舗Aです",
-        is_active=True
-    )
-    db_session.add(store)
-    db_session.commit()
-    db_session.refresh(store)
-    return store
+    return user_factory(USERS["owner_store_a"])
 
 
 @pytest.fixture
-def store_b(db_session):
+def manager_user_store_a(user_factory):
     """
-    テスト用店舗B
+    店舗Aのマネージャーユーザー
     """
-    from datetime import time
-    store = Store(
-        name="テスト店舗B",
-        address="東京都新宿区4-5-6",
-        phone_number="03-9876-5432",
-        email="storeb@test.com",
-        opening_time=time(10, 0),
-        closing_time=time(22, 0),
-        description="テスト用の店舗Bです",
-        is_active=True
-    )
-    db_session.add(store)
-    db_session.commit()
-    db_session.refresh(store)
-    return store
+    return user_factory(USERS["manager_store_a"])
 
 
 @pytest.fixture
-def owner_user_store_a(db_session, roles, store_a):
+def staff_user_store_a(user_factory):
     """
-    店舗Aのオーナーユーザー
+    店舗Aのスタッフユーザー
     """
-    user = User(
-        username="owner_store_a",
-        email="owner_a@test.com",
-        full_name="店舗Aオーナー",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        store_id=store_a.id,
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    user_role = UserRole(user_id=user.id, role_id=roles["owner"].id)
-    db_session.add(user_role)
-    db_session.commit()
-    
-    return user
+    return user_factory(USERS["staff_store_a"])
 
 
 @pytest.fixture
-def manager_user_store_a(db_session, roles, store_a):
+def owner_user_store_b(user_factory):
     """
-    店舗Aのマネージャーユーザー
+    店舗Bのオーナーユーザー
     """
-    user = User(
-        username="manager_store_a",
-        email="manager_a@test.com",
-        full_name="店舗Aマネージャー",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        store_id=store_a.id,
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    user_role = UserRole(user_id=user.id, role_id=roles["manager"].id)
-    db_session.add(user_role)
-    db_session.commit()
-    
-    return user
+    return user_factory(USERS["owner_store_b"])
 
 
 @pytest.fixture
-def staff_user_store_a(db_session, roles, store_a):
+def auth_headers_owner_store_a(client, owner_user_store_a, auth_headers_for):
     """
-    店舗Aのスタッフユーザー
+    店舗Aオーナーの認証ヘッダー
     """
-    user = User(
-        username="staff_store_a",
-        email="staff_a@test.com",
-        full_name="店舗Aスタッフ",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        store_id=store_a.id,
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    user_role = UserRole(user_id=user.id, role_id=roles["staff"].id)
-    db_session.add(user_role)
-    db_session.commit()
-    
-    return user
+    return auth_headers_for("owner_store_a")
 
 
 @pytest.fixture
-def owner_user_store_b(db_session, roles, store_b):
+def auth_headers_manager_store_a(client, manager_user_store_a, auth_headers_for):
     """
-    店舗Bのオーナーユーザー
+    店舗Aマネージャーの認証ヘッダー
     """
-    user = User(
-        username="owner_store_b",
-        email="owner_b@test.com",
-        full_name="店舗Bオーナー",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        store_id=store_b.id,
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    user_role = UserRole(user_id=user.id, role_id=roles["owner"].id)
-    db_session.add(user_role)
-    db_session.commit()
-    
-    return user
+    return auth_headers_for("manager_store_a")
 
 
 @pytest.fixture
-def auth_headers_owner_store_a(client, owner_user_store_a):
+def auth_headers_staff_store_a(client, staff_user_store_a, auth_headers_for):
     """
-    店舗Aオーナーの認証ヘッダー
+    店舗Aスタッフの認証ヘッダー
     """
-    token = get_auth_token(client, "owner_store_a", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("staff_store_a")
 
 
 @pytest.fixture
-def auth_headers_manager_store_a(client, manager_user_store_a):
+def auth_headers_owner_store_b(client, owner_user_store_b, auth_headers_for):
     """
-    店舗Aマネージャーの認証ヘッダー
+    店舗Bオーナーの認証ヘッダー
     """
-    token = get_auth_token(client, "manager_store_a", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("owner_store_b")
 
 
 @pytest.fixture
-def auth_headers_staff_store_a(client, staff_user_store_a):
+def owner_client(client, owner_user_store_a, _authenticated_clients):
     """
-    店舗Aスタッフの認証ヘッダー
+    店舗Aオーナーとして認証済みのクライアント
     """
-    token = get_auth_token(client, "staff_store_a", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return _authenticated_clients("owner_store_a")
 
 
 @pytest.fixture
-def auth_headers_owner_store_b(client, owner_user_store_b):
+def owner_b_client(client, owner_user_store_b, _authenticated_clients):
     """
-    店舗Bオーナーの認証ヘッダー
+    店舗Bオーナーとして認証済みのクライアント
     """
-    token = get_auth_token(client, "owner_store_b", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return _authenticated_clients("owner_store_b")
 
 
 @pytest.fixture
-def manager_user_store_b(db_session, roles, store_b):
+def manager_user_store_b(user_factory):
     """
     店舗Bのマネージャーユーザー
     """
-    user = User(
-        username="manager_store_b",
-        email="manager_b@test.com",
-        full_name="店舗Bマネージャー",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        store_id=store_b.id,
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    user_role = UserRole(user_id=user.id, role_id=roles["manager"].id)
-    db_session.add(user_role)
-    db_session.commit()
-    
-    return user
+    return user_factory(USERS["manager_store_b"])
 
 
 @pytest.fixture
-def staff_user_store_b(db_session, roles, store_b):
+def staff_user_store_b(user_factory):
     """
     店舗Bのスタッフユーザー
     """
-    user = User(
-        username="staff_store_b",
-        email="staff_b@test.com",
-        full_name="店舗Bスタッフ",
-        hashed_password=get_password_hash("password123"),
-        role="store",
-        store_id=store_b.id,
-        is_active=True
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    
-    user_role = UserRole(user_id=user.id, role_id=roles["staff"].id)
-    db_session.add(user_role)
-    db_session.commit()
-    
-    return user
+    return user_factory(USERS["staff_store_b"])
 
 
 @pytest.fixture
-def auth_headers_manager_store_b(client, manager_user_store_b):
+def auth_headers_manager_store_b(client, manager_user_store_b, auth_headers_for):
     """
     店舗Bマネージャーの認証ヘッダー
     """
-    token = get_auth_token(client, "manager_store_b", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("manager_store_b")
 
 
 @pytest.fixture
-def auth_headers_staff_store_b(client, staff_user_store_b):
+def auth_headers_staff_store_b(client, staff_user_store_b, auth_headers_for):
     """
     店舗Bスタッフの認証ヘッダー
     """
-    token = get_auth_token(client, "staff_store_b", "password123")
-    return {"Authorization": f"Bearer {token}"}
+    return auth_headers_for("staff_store_b")
 
 
 @pytest.fixture
@@ -725,7 +779,6 @@ def menu_store_a(db_session, store_a):
     )
     db_session.add(menu)
     db_session.commit()
-    db_session.refresh(menu)
     return menu
 
 
@@ -744,7 +797,6 @@ def menu_store_a_2(db_session, store_a):
     )
     db_session.add(menu)
     db_session.commit()
-    db_session.refresh(menu)
     return menu
 
 
@@ -763,7 +815,6 @@ def menu_store_b(db_session, store_b):
     )
     db_session.add(menu)
     db_session.commit()
-    db_session.refresh(menu)
     return menu
 
 
@@ -779,12 +830,11 @@ def order_store_a(db_session, customer_user_a, menu_store_a, store_a):
         quantity=2,
         total_price=menu_store_a.price * 2,
         status="pending",
-        ordered_at=datetime.utcnow(),
+        ordered_at=NOW,
         notes="店舗Aへの注文"
     )
     db_session.add(order)
     db_session.commit()
-    db_session.refresh(order)
     return order
 
 
@@ -800,12 +850,11 @@ def order_store_b(db_session, customer_user_b, menu_store_b, store_b):
         quantity=1,
         total_price=menu_store_b.price * 1,
         status="confirmed",
-        ordered_at=datetime.utcnow(),
+        ordered_at=NOW,
         notes="店舗Bへの注文"
     )
     db_session.add(order)
     db_session.commit()
-    db_session.refresh(order)
     return order
 
 
@@ -12,6 +12,8 @@ import pytest
 from datetime import datetime, timedelta, date
 from typing import List
 
+from tests.conftest import fast_json
+
 
 class TestGetAllOrders:
     """
@@ -23,7 +25,8 @@ class TestGetAllOrders:
         client, 
         auth_headers_store,
         orders_for_customer_a,
-        orders_for_customer_b
+        orders_for_customer_b,
+        assert_query_budget
     ):
         """
         テスト1: 全注文を正常に取得できること
@@ -32,14 +35,17 @@ class TestGetAllOrders:
         - ステータスコード200が返されること
         - 全ての注文が返されること（4件）
         - 注文情報が正しく含まれていること
+        - 注文件数に比例したクエリ（N+1）が発行されないこと
         """
-        response = client.get(
-            "/api/store/orders",
-            headers=auth_headers_store
-        )
+        # 認証(2) + 件数(1) + 注文・ユーザー・メニュー(1) + 役割(1) — 注文件数に依存しない
+        with assert_query_budget(max_queries=5):
+            response = client.get(
+                "/api/store/orders",
+                headers=auth_headers_store
+            )
         
         assert response.status_code == 200
-        data = response.json()
+        data = fast_json(response)
         
         assert "orders" in data
         assert "total" in data
@@ -74,14 +80,14 @@ class TestGetAllOrders:
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = fast_json(response)
         
         orders = data["orders"]
         assert len(orders) >= 2
         
         # 日付降順の確認
-        for i in range(len(orders) - 1):
-            assert orders[i]["ordered_at"] >= orders[i + 1]["ordered_at"]
+        timestamps = [order["ordered_at"] for order in orders]
+        assert timestamps == sorted(timestamps, reverse=True)
     
     def test_filter_by_status(
         self, 
@@ -127,7 +133,7 @@ class TestGetAllOrders:
         )
         
         assert response.status_code == 200
-        data = response.json()
+        data = fast_json(response)
         
         assert len(data["orders"]) == 2
         assert data["total"] == 4
@@ -170,66 +176,38 @@ class TestUpdateOrderStatus:
     PUT /api/store/orders/{order_id}/status のテストクラス
     """
     
+    @pytest.mark.parametrize("transitions", [
+        ["ready"],               # 単一の更新
+        ["ready", "completed"],  # 連続した更新
+    ])
     def test_update_status_success(
         self, 
         client, 
         auth_headers_store,
-        orders_for_customer_a
+        orders_for_customer_a,
+        transitions
     ):
         """
         テスト1: 注文ステータスを正常に更新できること
         
         検証項目:
-        - ステータスコード200が返されること
+        - 各更新でステータスコード200が返されること
         - ステータスが正しく更新されること
         """
         order = orders_for_customer_a[2]  # pending状態の注文
         
-        response = client.put(
-            f"/api/store/orders/{order.id}/status",
-            headers=auth_headers_store,
-            json={"status": "ready"}
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        
-        assert data["id"] == order.id
-        assert data["status"] == "ready"
-    
-    def test_update_status_to_preparing(
-        self, 
-        client, 
-        auth_headers_store,
-        orders_for_customer_a
-    ):
-        """
-        テスト2: ステータスをreadyに更新してからcompletedに更新できること
-        
-        検証項目:
-        - status=completedが正しく設定されること
-        """
-        order = orders_for_customer_a[2]  # pending状態の注文
-        
-        # まずreadyに更新
-        response = client.put(
-            f"/api/store/orders/{order.id}/status",
-            headers=auth_headers_store,
-            json={"status": "ready"}
-        )
-        assert response.status_code == 200
-        
-        # 次にcompletedに更新
-        response = client.put(
-            f"/api/store/orders/{order.id}/status",
-            headers=auth_headers_store,
-            json={"status": "completed"}
-        )
-        
-        assert response.status_code == 200
-        data = response.json()
-        
-        assert data["status"] == "completed"
+        for new_status in transitions:
+            response = client.put(
+                f"/api/store/orders/{order.id}/status",
+                headers=auth_headers_store,
+                json={"status": new_status}
+            )
+            
+            assert response.status_code == 200
+            data = response.json()
+            
+            assert data["id"] == order.id
+            assert data["status"] == new_status
     
     def test_update_status_order_not_found(
         self, 
@@ -739,323 +717,98 @@ class TestStatusTransitionRules:
     - cancelled → なし（終端）
     """
     
-    # pending からの遷移テスト
-    
-    def test_pending_to_ready_allowed(
-        self,
-        client,
-        auth_headers_store,
-        db_session,
-        sample_store,
-        sample_menu,
-        sample_customer
-    ):
-        """
-        ✅ pending → ready は許可される
-        """
+    @pytest.fixture
+    def create_order(self, db_session, sample_store, sample_menu, sample_customer):
+        """指定ステータスの注文を作成するヘルパー"""
         from models import Order
         
-        order = Order(
-            user_id=sample_customer.id,
-            menu_id=sample_menu.id,
-            store_id=sample_store.id,
-            quantity=1,
-            total_price=500,
-            status='pending',
-            ordered_at=datetime.now()
-        )
-        db_session.add(order)
-        db_session.commit()
-        
-        response = client.put(
-            f"/api/store/orders/{order.id}/status",
-            headers=auth_headers_store,
-            json={"status": "ready"}
-        )
-        
-        assert response.status_code == 200
-        assert response.json()["status"] == "ready"
-    
-    def test_pending_to_cancelled_allowed(
-        self,
-        client,
-        auth_headers_store,
-        db_session,
-        sample_store,
-        sample_menu,
-        sample_customer
-    ):
-        """
-        ✅ pending → cancelled は許可される
-        """
-        from models import Order
-        
-        order = Order(
-            user_id=sample_customer.id,
-            menu_id=sample_menu.id,
-            store_id=sample_store.id,
-            quantity=1,
-            total_price=500,
-            status='pending',
-            ordered_at=datetime.now()
-        )
-        db_session.add(order)
-        db_session.commit()
-        
-        response = client.put(
-            f"/api/store/orders/{order.id}/status",
-            headers=auth_headers_store,
-            json={"status": "cancelled"}
-        )
-        
-        assert response.status_code == 200
-        assert response.json()["status"] == "cancelled"
-    
-    def test_pending_to_completed_forbidden(
-        self,
-        client,
-        auth_headers_store,
-        db_session,
-        sample_store,
-        sample_menu,
-        sample_customer
-    ):
-        """
-        ❌ pending → completed は禁止される
-        """
-        from models import Order
-        
-        order = Order(
-            user_id=sample_customer.id,
-            menu_id=sample_menu.id,
-            store_id=sample_store.id,
-            quantity=1,
-            total_price=500,
-            status='pending',
-            ordered_at=datetime.now()
-        )
-        db_session.add(order)
-        db_session.commit()
-        
-        response = client.put(
-            f"/api/store/orders/{order.id}/status",
-            headers=auth_headers_store,
-            json={"status": "completed"}
-        )
-        
-        assert response.status_code == 400
-        assert "Invalid status transition" in response.json()["detail"]
-    
-    # ready からの遷移テスト
+        def _create(status):
+            order = Order(
+                user_id=sample_customer.id,
+                menu_id=sample_menu.id,
+                store_id=sample_store.id,
+                quantity=1,
+                total_price=500,
+                status=status,
+                ordered_at=datetime.now()
+            )
+            db_session.add(order)
+            db_session.commit()
+            return order
+        return _create
     
-    def test_ready_to_completed_allowed(
+    @pytest.mark.parametrize("current_status, new_status", [
+        ("pending", "ready"),
+        ("pending", "cancelled"),
+        ("ready", "completed"),
+    ])
+    def test_transition_allowed(
         self,
         client,
         auth_headers_store,
-        db_session,
-        sample_store,
-        sample_menu,
-        sample_customer
+        create_order,
+        current_status,
+        new_status
     ):
         """
-        ✅ ready → completed は許可される
+        ✅ 遷移ルールに含まれる遷移は許可される
         """
-        from models import Order
-        
-        order = Order(
-            user_id=sample_customer.id,
-            menu_id=sample_menu.id,
-            store_id=sample_store.id,
-            quantity=1,
-            total_price=500,
-            status='ready',
-            ordered_at=datetime.now()
-        )
-        db_session.add(order)
-        db_session.commit()
+        order = create_order(current_status)
         
         response = client.put(
             f"/api/store/orders/{order.id}/status",
             headers=auth_headers_store,
-            json={"status": "completed"}
+            json={"status": new_status}
         )
         
         assert response.status_code == 200
-        assert response.json()["status"] == "completed"
+        assert response.json()["status"] == new_status
     
-    def test_ready_to_pending_forbidden(
+    @pytest.mark.parametrize("current_status, new_status", [
+        ("pending", "completed"),
+        # ready からの逆行・キャンセル
+        ("ready", "pending"),
+        ("ready", "cancelled"),
+        # completed / cancelled は終端状態で、どのステータスにも遷移できない
+        ("completed", "pending"),
+        ("completed", "ready"),
+        ("completed", "cancelled"),
+        ("cancelled", "pending"),
+        ("cancelled", "ready"),
+        ("cancelled", "completed"),
+    ])
+    def test_transition_forbidden(
         self,
         client,
         auth_headers_store,
-        db_session,
-        sample_store,
-        sample_menu,
-        sample_customer
+        create_order,
+        current_status,
+        new_status
     ):
         """
-        ❌ ready → pending は禁止される（逆行）
+        ❌ 遷移ルールに含まれない遷移は禁止される
         """
-        from models import Order
-        
-        order = Order(
-            user_id=sample_customer.id,
-            menu_id=sample_menu.id,
-            store_id=sample_store.id,
-            quantity=1,
-            total_price=500,
-            status='ready',
-            ordered_at=datetime.now()
-        )
-        db_session.add(order)
-        db_session.commit()
+        order = create_order(current_status)
         
         response = client.put(
             f"/api/store/orders/{order.id}/status",
             headers=auth_headers_store,
-            json={"status": "pending"}
+            json={"status": new_status}
         )
         
         assert response.status_code == 400
         assert "Invalid status transition" in response.json()["detail"]
     
-    def test_ready_to_cancelled_forbidden(
-        self,
-        client,
-        auth_headers_store,
-        db_session,
-        sample_store,
-        sample_menu,
-        sample_customer
-    ):
-        """
-        ❌ ready → cancelled は禁止される
-        """
-        from models import Order
-        
-        order = Order(
-            user_id=sample_customer.id,
-            menu_id=sample_menu.id,
-            store_id=sample_store.id,
-            quantity=1,
-            total_price=500,
-            status='ready',
-            ordered_at=datetime.now()
-        )
-        db_session.add(order)
-        db_session.commit()
-        
-        response = client.put(
-            f"/api/store/orders/{order.id}/status",
-            headers=auth_headers_store,
-            json={"status": "cancelled"}
-        )
-        
-        assert response.status_code == 400
-        assert "Invalid status transition" in response.json()["detail"]
-    
-    # completed からの遷移テスト（終端状態）
-    
-    def test_completed_to_any_forbidden(
-        self,
-        client,
-        auth_headers_store,
-        db_session,
-        sample_store,
-        sample_menu,
-        sample_customer
-    ):
-        """
-        ❌ completed は終端状態で、どのステータスにも遷移できない
-        """
-        from models import Order
-        
-        order = Order(
-            user_id=sample_customer.id,
-            menu_id=sample_menu.id,
-            store_id=sample_store.id,
-            quantity=1,
-            total_price=500,
-            status='completed',
-            ordered_at=datetime.now()
-        )
-        db_session.add(order)
-        db_session.commit()
-        
-        # 全ての遷移を試す
-        for new_status in ['pending', 'ready', 'cancelled']:
-            response = client.put(
-                f"/api/store/orders/{order.id}/status",
-                headers=auth_headers_store,
-                json={"status": new_status}
-            )
-            
-            assert response.status_code == 400
-            assert "Invalid status transition" in response.json()["detail"]
-    
-    # cancelled からの遷移テスト（終端状態）
-    
-    def test_cancelled_to_any_forbidden(
-        self,
-        client,
-        auth_headers_store,
-        db_session,
-        sample_store,
-        sample_menu,
-        sample_customer
-    ):
-        """
-        ❌ cancelled は終端状態で、どのステータスにも遷移できない
-        """
-        from models import Order
-        
-        order = Order(
-            user_id=sample_customer.id,
-            menu_id=sample_menu.id,
-            store_id=sample_store.id,
-            quantity=1,
-            total_price=500,
-            status='cancelled',
-            ordered_at=datetime.now()
-        )
-        db_session.add(order)
-        db_session.commit()
-        
-        # 全ての遷移を試す
-        for new_status in ['pending', 'ready', 'completed']:
-            response = client.put(
-                f"/api/store/orders/{order.id}/status",
-                headers=auth_headers_store,
-                json={"status": new_status}
-            )
-            
-            assert response.status_code == 400
-            assert "Invalid status transition" in response.json()["detail"]
-    
     def test_same_status_update_allowed(
         self,
         client,
         auth_headers_store,
-        db_session,
-        sample_store,
-        sample_menu,
-        sample_customer
+        create_order
     ):
         """
         ✅ 同じステータスへの更新は許可される（冪等性）
         """
-        from models import Order
-        
-        order = Order(
-            user_id=sample_customer.id,
-            menu_id=sample_menu.id,
-            store_id=sample_store.id,
-            quantity=1,
-            total_price=500,
-            status='pending',
-            ordered_at=datetime.now()
-        )
-        db_session.add(order)
-        db_session.commit()
+        order = create_order("pending")
         
         response = client.put(
             f"/api/store/orders/{order.id}/status",
@@ -1083,7 +836,8 @@ class TestMultiTenantIsolation:
         self,
         client,
         db_session,
-        roles
+        roles,
+        auth_headers_for
     ):
         """
         店舗Aは店舗Bの注文を閲覧できないこと
@@ -1209,18 +963,8 @@ class TestMultiTenantIsolation:
         db_session.add(order_b)
         db_session.commit()
         
-        # 店舗Aのトークン取得
-        login_response = client.post(
-            "/api/auth/login",
-            data={"username": "staff_a", "password": "dummy"}
-        )
-        # NOTE: 実際はハッシュ化されたパスワードが必要なので、このテストは要調整
-        # ここでは概念的なテストとして記述
-        
-        # または直接トークン生成（テスト用）
-        from auth import create_access_token
-        token_a = create_access_token({"sub": staff_a.username, "user_id": staff_a.id})
-        headers_a = {"Authorization": f"Bearer {token_a}"}
+        # 店舗Aのスタッフの認証ヘッダー（パスワードはダミーのためログインAPIは経由しない）
+        headers_a = auth_headers_for(staff_a.username)
         
         # 店舗Aのスタッフで注文一覧取得
         response = client.get(